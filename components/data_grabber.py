@@ -1,9 +1,126 @@
-import yfinance as yf
-from fredapi import Fred
 import pandas as pd
-from forex_python.converter import CurrencyRates
+import numpy as np
+import orjson
 import requests
+from scraper import SESSION
+import copy
+import functools
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+def _ttl_cache(ttl, maxsize=32, should_cache=None):
+    """
+    Caches a function's return value per set of arguments for `ttl` seconds.
+
+    Only results accepted by `should_cache` are stored (by default anything but None), so
+    failed fetches are retried on the next call. At most `maxsize` entries are kept: expired
+    entries are dropped first, then the oldest. Callers get a shallow copy of the cached value
+    so mutating a result can't corrupt the cache. The wrapped function gains a cache_clear() method.
+    """
+    if should_cache is None:
+        should_cache = lambda value: value is not None
+
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                hit = cache.get(key)
+                if hit is not None:
+                    if time.monotonic() - hit[0] < ttl:
+                        return copy.copy(hit[1])
+                    del cache[key]
+
+            value = func(*args, **kwargs)
+            if not should_cache(value):
+                return value
+
+            with lock:
+                now = time.monotonic()
+                if len(cache) >= maxsize:
+                    for stale in [k for k, (stored, _) in cache.items() if now - stored >= ttl]:
+                        del cache[stale]
+                while len(cache) >= maxsize:
+                    # Dicts keep insertion order, so the first key is the oldest entry
+                    del cache[next(iter(cache))]
+                cache[key] = (now, value)
+            return copy.copy(value)
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+SPARK_URL = "https://query1.finance.yahoo.com/v8/finance/spark"
+SPARK_BATCH_SIZE = 20  # Max symbols Yahoo accepts per spark request
+
+def _get_spark_chunk(symbols):
+    """
+    Retrieves the latest close for up to SPARK_BATCH_SIZE symbols in a single spark request.
+
+    Returns:
+        dict: Mapping of symbol to its last non-null close. Symbols with no data are omitted.
+    """
+    params = {
+        "symbols": ",".join(symbols),
+        "range": "1d",
+        "interval": "5m",
+        "indicators": "close",
+        "includeTimestamps": "false",
+        "corsDomain": "finance.yahoo.com",
+        ".tsrc": "finance",
+    }
+    response = SESSION.get(SPARK_URL, params=params, timeout=10)
+    response.raise_for_status()
+
+    prices = {}
+    for result in response.json()["spark"]["result"]:
+        try:
+            closes = result["response"][0]["indicators"]["quote"][0]["close"]
+        except (KeyError, IndexError, TypeError):
+            continue
+        # A symbol with no data can come back as "close": null; skip it rather than fail the batch
+        if not closes:
+            continue
+        # Intraday bars that haven't printed yet come back as null
+        latest = next((close for close in reversed(closes) if close is not None), None)
+        if latest is not None:
+            prices[result["symbol"]] = latest
+    return prices
+
+def get_prices(symbols):
+    """
+    Retrieves the latest prices for a list of Yahoo Finance symbols.
+
+    Symbols are batched SPARK_BATCH_SIZE at a time into Yahoo's spark endpoint and the
+    batches are fetched concurrently.
+
+    Args:
+        symbols (list of str): Yahoo Finance tickers (e.g., ["^GSPC", "AAPL"]).
+
+    Returns:
+        dict: Mapping of symbol to its latest price. Symbols that could not be retrieved
+              are omitted.
+    """
+    chunks = [symbols[i:i + SPARK_BATCH_SIZE] for i in range(0, len(symbols), SPARK_BATCH_SIZE)]
+    prices = {}
+    if not chunks:
+        return prices
+
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        future_to_chunk = {executor.submit(_get_spark_chunk, chunk): chunk for chunk in chunks}
+        for future in as_completed(future_to_chunk):
+            try:
+                prices.update(future.result())
+            except Exception as e:
+                print(f"Error retrieving prices for {future_to_chunk[future]}:", e)
+    return prices
+
+@_ttl_cache(ttl=60)
 def get_sp500_price():
     """
     Retrieves the current S&P 500 index price.
@@ -14,21 +131,62 @@ def get_sp500_price():
     """
     try:
         # Yahoo Finance ticker for S&P 500 is "^GSPC"
-        sp500 = yf.Ticker("^GSPC")
-        
-        # Get historical data for the most recent day
-        hist = sp500.history(period="1d")
-        
-        if hist.empty:
+        price = get_prices(["^GSPC"]).get("^GSPC")
+        if price is None:
             raise ValueError("No data fetched for S&P 500 index.")
-        
-        # Use the last closing price from the historical data
-        price = hist['Close'].iloc[-1]
         return price
     except Exception as e:
         print("Error retrieving S&P 500 index price:", e)
         return None
 
+FRED_OBSERVATIONS_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+def _get_latest_fred_value(series_id, api_key, limit=10):
+    """
+    Retrieves the most recent observation of a FRED series.
+
+    Only the newest `limit` observations are requested rather than the full history.
+    FRED marks missing days (e.g. market holidays) with ".", so the newest non-missing
+    value among them is returned.
+
+    Args:
+        series_id (str): The FRED series identifier (e.g., "SOFR").
+        api_key (str): Your FRED API key.
+        limit (int): How many of the newest observations to scan for a value.
+
+    Returns:
+        float: The latest available value of the series.
+
+    Raises:
+        ValueError: If the request fails. The message carries FRED's error_message rather
+                    than the request URL, which would expose the API key.
+    """
+    params = {
+        "series_id": series_id,
+        "api_key": api_key,
+        "file_type": "json",
+        "sort_order": "desc",
+        "limit": limit,
+    }
+    try:
+        response = SESSION.get(FRED_OBSERVATIONS_URL, params=params, timeout=10)
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        try:
+            detail = orjson.loads(e.response.content)["error_message"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            detail = f"HTTP {e.response.status_code}"
+        raise ValueError(f"FRED request for {series_id} failed: {detail}") from None
+    except requests.RequestException as e:
+        # Connection and retry errors embed the full URL, so report only the error type
+        raise ValueError(f"FRED request for {series_id} failed: {type(e).__name__}") from None
+
+    for observation in orjson.loads(response.content)["observations"]:
+        if observation["value"] != ".":
+            return float(observation["value"])
+    raise ValueError("No data returned for series ID: " + series_id)
+
+@_ttl_cache(ttl=3600)
 def get_sofr_rate(api_key):
     """
     Retrieves the latest SOFR (Secured Overnight Financing Rate) using the FRED API.
@@ -40,79 +198,114 @@ def get_sofr_rate(api_key):
         float: The latest available SOFR rate, or None if not retrieved.
     """
     try:
-        # Initialize the Fred client with your API key
-        fred = Fred(api_key=api_key)
-        
-        # Fetch the SOFR time series data from FRED.
         # The FRED series identifier for the SOFR rate is "SOFR".
-        data = fred.get_series('SOFR')
-        
-        # Check if any data was returned
-        if data.empty:
-            raise ValueError("No data fetched for SOFR rate.")
-        
-        # Extract the most recent rate from the series
-        sofr_rate = data.iloc[-1]
-        return sofr_rate
+        return _get_latest_fred_value('SOFR', api_key)
     except Exception as e:
         print("Error retrieving SOFR rate:", e)
         return None
 
+# Mapping of term labels to FRED series IDs
+TREASURY_SERIES = {
+    "3M": "DGS3MO",  # 3-Month Treasury
+    "6M": "DGS6MO",  # 6-Month Treasury
+    "1Y": "DGS1",    # 1-Year Treasury
+    "2Y": "DGS2",    # 2-Year Treasury
+    "3Y": "DGS3",    # 3-Year Treasury
+    "5Y": "DGS5",    # 5-Year Treasury
+    "7Y": "DGS7",    # 7-Year Treasury (if available)
+    "10Y": "DGS10",  # 10-Year Treasury
+    "20Y": "DGS20",  # 20-Year Treasury (if available)
+    "30Y": "DGS30"   # 30-Year Treasury
+}
+
+# A curve missing any term is returned but not cached, so the gaps are retried next call
+@_ttl_cache(ttl=3600, should_cache=lambda curve: curve is not None and len(curve) == len(TREASURY_SERIES))
 def get_treasury_yield_curve(api_key):
     """
-    Retrieves the latest U.S. Treasury yields for various maturities using the FRED API and
-    organizes them in a two-column pandas DataFrame.
+    Retrieves the latest U.S. Treasury yields for various maturities using the FRED API.
 
     Args:
         api_key (str): Your FRED API key.
 
     Returns:
-        pandas.DataFrame: A DataFrame with columns "Term" and "Rate" containing the latest
-                          rates for each maturity.
-                          Returns None if there was an error retrieving the data.
+        dict: Mapping of term (e.g., "3M", "10Y") to its latest rate, ordered from shortest
+              to longest maturity. Terms that could not be retrieved are omitted.
+              Returns None if no rates could be retrieved.
     """
     try:
-        fred = Fred(api_key=api_key)
-
-        # Mapping of term labels to FRED series IDs
-        rates_mapping = {
-            "3M": "DGS3MO",  # 3-Month Treasury
-            "6M": "DGS6MO",  # 6-Month Treasury
-            "1Y": "DGS1",    # 1-Year Treasury
-            "2Y": "DGS2",    # 2-Year Treasury
-            "3Y": "DGS3",    # 3-Year Treasury
-            "5Y": "DGS5",    # 5-Year Treasury
-            "7Y": "DGS7",    # 7-Year Treasury (if available)
-            "10Y": "DGS10",  # 10-Year Treasury
-            "20Y": "DGS20",  # 20-Year Treasury (if available)
-            "30Y": "DGS30"   # 30-Year Treasury
-        }
-
-        results = []
-        for term, series_id in rates_mapping.items():
-            try:
-                # Retrieve the time series for the treasury rate
-                series = fred.get_series(series_id)
-                if series.empty:
-                    raise ValueError("No data returned for series ID: " + series_id)
-                
-                # Get the most recent non-NaN value from the series
-                latest_value = series.dropna().iloc[-1]
-                results.append((term, latest_value))
-            except Exception as e:
-                print(f"Error retrieving data for {term} ({series_id}):", e)
-                # Optionally, you can decide whether to continue or return None.
-                # For now, we simply skip this term.
+        rates_mapping = TREASURY_SERIES
+
+        # Each lookup is a blocking HTTPS round-trip, so fetch all maturities concurrently
+        rate_by_term = {}
+        with ThreadPoolExecutor(max_workers=len(rates_mapping)) as executor:
+            future_to_term = {executor.submit(_get_latest_fred_value, series_id, api_key): term
+                              for term, series_id in rates_mapping.items()}
+            for future in as_completed(future_to_term):
+                term = future_to_term[future]
+                try:
+                    rate_by_term[term] = future.result()
+                except Exception as e:
+                    print(f"Error retrieving data for {term} ({rates_mapping[term]}):", e)
+                    # For now, we simply skip this term.
+
+        if not rate_by_term:
+            raise ValueError("No treasury rates could be retrieved.")
 
-        # Convert the list of tuples into a DataFrame with columns "Term" and "Rate"
-        df = pd.DataFrame(results, columns=["Term", "Rate"])
-        return df
+        # Iterate the mapping so the output keeps the original term ordering
+        return {term: rate_by_term[term] for term in rates_mapping if term in rate_by_term}
 
     except Exception as e:
         print("Error retrieving treasury yield curve data:", e)
         return None
 
 
+@_ttl_cache(ttl=300)
+def _get_forex_rates(reference_base):
+    """
+    Retrieves the latest forex rates relative to `reference_base` from exchangerate-api.com.
+
+    Returns:
+        dict: Mapping of currency code to rate, or None if the rates could not be retrieved.
+    """
+    # URL to get the latest forex data relative to the reference base currency.
+    url = f"https://api.exchangerate-api.com/v4/latest/{reference_base}"
+    
+    try:
+        response = SESSION.get(url, timeout=10)
+        response.raise_for_status()  # raise an exception for HTTP errors
+        data = response.json()
+    except requests.RequestException as e:
+        print("Error fetching forex data:", e)
+        return None
+    
+    rates = data.get("rates", {})
+    if not rates:
+        print("No rates data returned from the API.")
+        return None
+    return rates
+
+def get_rate(from_currency, to_currency, reference_base="USD"):
+    """
+    Retrieves the conversion rate between two currencies without building the full matrix.
+
+    Parameters:
+        from_currency (str): The currency to convert from (e.g., 'EUR').
+        to_currency (str): The currency to convert to (e.g., 'JPY').
+        reference_base (str): The base currency used to fetch exchange rates (default 'USD').
+
+    Returns:
+        float: How many units of to_currency one unit of from_currency buys, or None if
+               either currency is unavailable.
+    """
+    rates = _get_forex_rates(reference_base)
+    if rates is None:
+        return None
+
+    if from_currency not in rates or to_currency not in rates:
+        print(f"Rates for {from_currency} and/or {to_currency} were not found in the API data.")
+        return None
+    return rates[to_currency] / rates[from_currency]
+
 def get_forex_matrix(currencies=None, reference_base="USD"):
     """
     Retrieves forex rates based on a reference base (default 'USD') from a free API
@@ -130,20 +323,8 @@ def get_forex_matrix(currencies=None, reference_base="USD"):
                           
     Note: This function uses the free API provided by exchangerate-api.com.
     """
-    # URL to get the latest forex data relative to the reference base currency.
-    url = f"https://api.exchangerate-api.com/v4/latest/{reference_base}"
-    
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # raise an exception for HTTP errors
-        data = response.json()
-    except requests.RequestException as e:
-        print("Error fetching forex data:", e)
-        return None
-    
-    rates = data.get("rates", {})
-    if not rates:
-        print("No rates data returned from the API.")
+    rates = _get_forex_rates(reference_base)
+    if rates is None:
         return None
 
     # If no specific currencies are provided, use all available
@@ -159,50 +340,72 @@ def get_forex_matrix(currencies=None, reference_base="USD"):
     # Build the conversion matrix:
     # The conversion from currency i to currency j is calculated as:
     #     rate(j)/rate(i)
-    matrix = {}
-    for i in currencies:
-        row = {}
-        rate_i = rates[i]
-        for j in currencies:
-            rate_j = rates[j]
-            row[j] = rate_j / rate_i
-        matrix[i] = row
+    # Divide directly rather than multiplying by 1/rate(i): (1/x)*x is not always exactly 1.0.
+    # For the usual handful of currencies this is a couple of microseconds, well under the
+    # cost of building the DataFrame below, so there is deliberately no separate small-N path.
+    rate_vec = np.fromiter((rates[cur] for cur in currencies), dtype=np.float64, count=len(currencies))
+    matrix = rate_vec[None, :] / rate_vec[:, None]
 
     # Create and return a DataFrame for better display/manipulation.
-    forex_matrix = pd.DataFrame(matrix).T
+    forex_matrix = pd.DataFrame(matrix, index=currencies, columns=currencies)
     return forex_matrix
 
+def fetch_all(api_key, currencies=None):
+    """
+    Fetches the S&P 500 price, SOFR rate, treasury yield curve and forex matrix concurrently.
+
+    The four fetches are independent network calls, so total wall-time is roughly that of the
+    slowest one rather than the sum of all four.
+
+    Args:
+        api_key (str): Your FRED API key.
+        currencies (list of str, optional): Currency codes passed to get_forex_matrix.
+
+    Returns:
+        dict: The results keyed by "sp500", "sofr", "yield_curve" and "forex". Each value is
+              whatever the underlying function returned (None on failure).
+    """
+    tasks = {
+        "sp500": (get_sp500_price, ()),
+        "sofr": (get_sofr_rate, (api_key,)),
+        "yield_curve": (get_treasury_yield_curve, (api_key,)),
+        "forex": (get_forex_matrix, (currencies,)),
+    }
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {name: executor.submit(func, *args) for name, (func, args) in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
 # Example usage:
 if __name__ == "__main__":
-    # Assuming these functions are defined elsewhere in your code:
-    # get_sp500_price(), get_sofr_rate(api_key), get_treasury_yield_curve(api_key)
-    
+    from config import FRED_API_KEY
+
+    currencies_list = ['USD', 'EUR', 'GBP', 'JPY']
+    data = fetch_all(FRED_API_KEY, currencies=currencies_list)
+
     # Retrieve and print S&P 500 price
-    price = get_sp500_price()
+    price = data["sp500"]
     if price is not None:
         print(f"The current S&P 500 index price is: {price}")
     else:
         print("Could not retrieve the S&P 500 index price.")
-        
-    # Replace with your actual FRED API key.
     
     # Retrieve and print SOFR rate
-    rate = get_sofr_rate(FRED_API_KEY)
+    rate = data["sofr"]
     if rate is not None:
         print(f"The latest SOFR rate is: {rate}")
     else:
         print("Could not retrieve the SOFR rate.")
     
     # Retrieve and print the Treasury yield curve
-    yield_df = get_treasury_yield_curve(FRED_API_KEY)
-    if yield_df is not None:
+    yield_curve = data["yield_curve"]
+    if yield_curve is not None:
         print("Latest Treasury Yields:")
-        print(yield_df)
+        print(pd.DataFrame(list(yield_curve.items()), columns=["Term", "Rate"]))
     else:
         print("Could not retrieve the treasury yield curve data.")
     
-    currencies_list = ['USD', 'EUR', 'GBP', 'JPY']
-    forex_df = get_forex_matrix(currencies=currencies_list)
+    forex_df = data["forex"]
 
     if forex_df is not None:
         print("Forex Conversion Matrix:")
@@ -5,6 +5,7 @@ import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import psycopg2  # Ensure you have installed psycopg2-binary
 import numpy as np
+import threading
 from config import FRED_API_KEY, DB_CONFIG
 
 class FinancialDataFetcher:
@@ -50,6 +51,9 @@ class FinancialDataFetcher:
                                         { "dbname": "...", "user": "...", "password": "...", "host": "...", "port": ... }
         """
         self.fred_api_key = fred_api_key
+        # One FRED client for the lifetime of the fetcher, created on first use
+        self._fred = None
+        self._fred_lock = threading.Lock()
         self.reference_base = reference_base
         self.db_config = db_config
         self.conn = None
@@ -59,6 +63,20 @@ class FinancialDataFetcher:
         if self.db_config:
             self._open_connection()
 
+    def _get_fred(self):
+        """
+        Returns the shared Fred client, creating it on first use.
+
+        Construction is deferred so that a missing key surfaces as fredapi's own error at
+        fetch time, and so that fred_api_key=None still falls back to the FRED_API_KEY
+        environment variable.
+        """
+        # get_all_treasury_rates calls this from several threads at once
+        with self._fred_lock:
+            if self._fred is None:
+                self._fred = Fred(api_key=self.fred_api_key)
+            return self._fred
+
     def _open_connection(self):
         """Opens a persistent connection to the PostgreSQL database on Supabase."""
         try:
@@ -167,8 +185,7 @@ class FinancialDataFetcher:
             float: The latest available SOFR rate, or None if not retrieved.
         """
         try:
-            fred = Fred(api_key=self.fred_api_key)
-            data = fred.get_series('SOFR')
+            data = self._get_fred().get_series('SOFR')
             if data.empty:
                 raise ValueError("No data fetched for SOFR rate.")
             sofr_rate = data.iloc[-1]
@@ -205,11 +222,18 @@ class FinancialDataFetcher:
 
         series_id = rates_mapping[term]
         try:
-            fred = Fred(api_key=self.fred_api_key)
-            series = fred.get_series(series_id)
+            series = self._get_fred().get_series(series_id)
             if series.empty:
                 raise ValueError("No data returned for series ID: " + series_id)
-            latest_value = series.dropna().iloc[-1]
+            # Walk back from the end to the first non-NaN (x != x only for NaN)
+            # instead of copying the whole series with dropna()
+            values = series.values
+            i = values.size - 1
+            while i >= 0 and values[i] != values[i]:
+                i -= 1
+            if i < 0:
+                raise ValueError("No non-NaN data for series ID: " + series_id)
+            latest_value = values[i]
             return latest_value
         except Exception as e:
             print(f"Error retrieving data for {term} ({series_id}):", e)
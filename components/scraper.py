@@ -1,42 +1,84 @@
 from bs4 import BeautifulSoup# Soup object for HTML response
 import requests #HTTP
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+
+# Shared session so repeat requests reuse keep-alive connections instead of
+# paying a fresh TCP+TLS handshake each time. pool_maxsize is kept above the
+# 10-way FRED fan-out in data_grabber so every one of those connections stays
+# pooled between calls.
+SESSION = requests.Session()
+SESSION.headers.update({
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/113.0.0.0 Safari/537.36"
+    )
+})
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
 
 
 def getResponse(url):
     """HTTP GET request"""
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/113.0.0.0 Safari/537.36"
-        )
-    }
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url, timeout=10)
     if response.status_code != 200:
         raise Exception(f"Failed to retrieve data. HTTP Status code: {response.status_code}")
     #if response:
         #print("I got a response here in getResponse.")
-    return BeautifulSoup(response.content, "html.parser")
+    return BeautifulSoup(response.content, "lxml")
+
+def _matches(element, html_id):
+    """Checks a parsed span against an attribute dict or class name"""
+    if isinstance(html_id, dict):
+        return all(element.get(attr) == value for attr, value in html_id.items())
+    return html_id in (element.get("class") or "").split()
+
+def _streamFind(url, html_id):
+    """Streams url through a pull parser and returns the first matching span as HTML
+
+    Parsing overlaps with the download and stops as soon as the span closes,
+    so the rest of the page is never read. Returns None if nothing matches.
+
+    Leaving the body unread means urllib3 discards the connection instead of
+    returning it to SESSION's pool, so each call pays a fresh handshake. That is
+    the trade for not downloading and parsing the remaining ~1-2 MB of page.
+    """
+    with SESSION.get(url, timeout=10, stream=True) as response:
+        if response.status_code != 200:
+            raise Exception(f"Failed to retrieve data. HTTP Status code: {response.status_code}")
+        # Only trust an explicit charset; requests reports ISO-8859-1 for any text/* without one,
+        # and leaving it unset lets lxml pick up a <meta charset> instead.
+        content_type = response.headers.get("Content-Type", "").lower()
+        encoding = response.encoding if "charset=" in content_type else None
+        parser = etree.HTMLPullParser(events=("end",), tag="span", encoding=encoding)
+        for chunk in response.iter_content(chunk_size=65536):
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if _matches(element, html_id):
+                    return etree.tostring(element, with_tail=False)
+    parser.close()
+    for _, element in parser.read_events():
+        if _matches(element, html_id):
+            return etree.tostring(element, with_tail=False)
+    return None
 
 def getData(url, html_id):
-    """Gets attributes for equity, fixed income, and currencies"""
-    soup_object=getResponse(url)
-
-    #Add find statement if finding another html_attr)
-    #coochribute= soup_object.find(html_attr, class_=html_id)
-
-    try:
-        coochribute= soup_object.find('span', html_id)
-    except AttributeError:
-        print("Attribute not found.")
-    try:
-        coochribute= soup_object.find('class', html_id)
-    except AttributeError:
-        print("Attribute not found.")
-    """ try:
-        coochribute= soup_object.find(html_attr, class_=html_id)
-    except AttributeError:
-        print("Attribute not found.")
-
- """
-    return coochribute
\ No newline at end of file
+    """Gets attributes for equity, fixed income, and currencies
+
+    html_id is either a dict of attributes (e.g. {"data-testid": "qsp-price"})
+    or a class name string.
+    """
+    fragment=_streamFind(url, html_id)
+    if fragment is None:
+        return None
+
+    # Hand callers the same BeautifulSoup tag as before. The fragment is just the
+    # matched span, so its first span is the target.
+    return BeautifulSoup(fragment, "lxml").find('span')
@@ -0,0 +1,236 @@
+import os
+import sys
+from unittest import mock
+
+import orjson
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "components"))
+
+import data_grabber
+
+API_KEY = "SECRET-FRED-KEY"
+
+
+def json_response(payload, status_code=200, url="https://example.com"):
+    """Builds a real requests.Response so raise_for_status behaves as it would live"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = orjson.dumps(payload)
+    response.url = url
+    return response
+
+
+def fred_response(*values):
+    return json_response({"observations": [{"value": value} for value in values]})
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for func in (data_grabber.get_sp500_price, data_grabber.get_sofr_rate,
+                 data_grabber.get_treasury_yield_curve, data_grabber._get_forex_rates):
+        func.cache_clear()
+
+
+def fake_fred(failing=()):
+    """Stands in for _get_latest_fred_value, failing for the given series ids"""
+    calls = []
+
+    def lookup(series_id, api_key):
+        calls.append(series_id)
+        if series_id in failing:
+            raise ValueError("FRED request for " + series_id + " failed: HTTP 500")
+        return float(len(series_id))
+    return lookup, calls
+
+
+def test_ttl_cache_expires_entries():
+    calls = []
+
+    @data_grabber._ttl_cache(ttl=60)
+    def fetch(x):
+        calls.append(x)
+        return x
+
+    with mock.patch.object(data_grabber.time, "monotonic", return_value=0.0):
+        fetch(1)
+        fetch(1)
+    assert calls == [1]
+    with mock.patch.object(data_grabber.time, "monotonic", return_value=61.0):
+        fetch(1)
+    assert calls == [1, 1]
+
+
+def test_ttl_cache_evicts_oldest_beyond_maxsize():
+    calls = []
+
+    @data_grabber._ttl_cache(ttl=60, maxsize=2)
+    def fetch(x):
+        calls.append(x)
+        return x
+
+    fetch(1)
+    fetch(2)
+    fetch(3)
+    fetch(3)
+    fetch(2)
+    assert calls == [1, 2, 3]
+    fetch(1)
+    assert calls == [1, 2, 3, 1]
+
+
+def test_ttl_cache_skips_values_rejected_by_should_cache():
+    calls = []
+
+    @data_grabber._ttl_cache(ttl=60, should_cache=lambda value: value > 0)
+    def fetch(x):
+        calls.append(x)
+        return x
+
+    fetch(0)
+    fetch(0)
+    assert calls == [0, 0]
+
+
+def test_partial_yield_curve_is_not_cached():
+    lookup, calls = fake_fred(failing={"DGS20"})
+    with mock.patch.object(data_grabber, "_get_latest_fred_value", side_effect=lookup):
+        curve = data_grabber.get_treasury_yield_curve(API_KEY)
+        assert "20Y" not in curve
+        assert len(curve) == len(data_grabber.TREASURY_SERIES) - 1
+        data_grabber.get_treasury_yield_curve(API_KEY)
+    assert len(calls) == 2 * len(data_grabber.TREASURY_SERIES)
+
+
+def test_empty_yield_curve_returns_none_and_is_not_cached():
+    lookup, calls = fake_fred(failing=set(data_grabber.TREASURY_SERIES.values()))
+    with mock.patch.object(data_grabber, "_get_latest_fred_value", side_effect=lookup):
+        assert data_grabber.get_treasury_yield_curve(API_KEY) is None
+        assert data_grabber.get_treasury_yield_curve(API_KEY) is None
+    assert len(calls) == 2 * len(data_grabber.TREASURY_SERIES)
+
+
+def test_full_yield_curve_is_cached_in_term_order():
+    lookup, calls = fake_fred()
+    with mock.patch.object(data_grabber, "_get_latest_fred_value", side_effect=lookup):
+        curve = data_grabber.get_treasury_yield_curve(API_KEY)
+        data_grabber.get_treasury_yield_curve(API_KEY)
+    assert list(curve) == list(data_grabber.TREASURY_SERIES)
+    assert len(calls) == len(data_grabber.TREASURY_SERIES)
+
+
+def test_cached_yield_curve_cannot_be_mutated_by_callers():
+    lookup, _ = fake_fred()
+    with mock.patch.object(data_grabber, "_get_latest_fred_value", side_effect=lookup):
+        first = data_grabber.get_treasury_yield_curve(API_KEY)
+        first.pop("3M")
+        second = data_grabber.get_treasury_yield_curve(API_KEY)
+        second["10Y"] = -1.0
+        third = data_grabber.get_treasury_yield_curve(API_KEY)
+    assert "3M" in third
+    assert third["10Y"] == float(len("DGS10"))
+
+
+def test_latest_fred_value_skips_missing_marker():
+    with mock.patch.object(data_grabber.SESSION, "get", return_value=fred_response(".", ".", "4.33", "4.31")) as get:
+        assert data_grabber._get_latest_fred_value("DGS10", API_KEY) == 4.33
+    params = get.call_args.kwargs["params"]
+    assert params["sort_order"] == "desc"
+    assert params["limit"] == 10
+
+
+def test_latest_fred_value_all_missing_raises():
+    with mock.patch.object(data_grabber.SESSION, "get", return_value=fred_response(".", ".")):
+        with pytest.raises(ValueError, match="DGS10"):
+            data_grabber._get_latest_fred_value("DGS10", API_KEY)
+
+
+def test_fred_http_error_reports_error_message_not_api_key(capsys):
+    url = f"{data_grabber.FRED_OBSERVATIONS_URL}?series_id=SOFR&api_key={API_KEY}"
+    payload = {"error_code": 400, "error_message": "Bad Request.  The value for variable api_key is not registered."}
+    with mock.patch.object(data_grabber.SESSION, "get", return_value=json_response(payload, 400, url)):
+        assert data_grabber.get_sofr_rate(API_KEY) is None
+    out = capsys.readouterr().out
+    assert "is not registered" in out
+    assert API_KEY not in out
+
+
+def test_fred_connection_error_does_not_print_api_key(capsys):
+    url = f"{data_grabber.FRED_OBSERVATIONS_URL}?series_id=DGS10&api_key={API_KEY}"
+    error = requests.ConnectionError(f"Max retries exceeded with url: {url}")
+    with mock.patch.object(data_grabber.SESSION, "get", side_effect=error):
+        assert data_grabber.get_treasury_yield_curve(API_KEY) is None
+    out = capsys.readouterr().out
+    assert "ConnectionError" in out
+    assert API_KEY not in out
+
+
+def spark_result(symbol, closes):
+    return {"symbol": symbol, "response": [{"indicators": {"quote": [{"close": closes}]}}]}
+
+
+def test_get_prices_takes_last_non_null_close():
+    payload = {"spark": {"result": [spark_result("^GSPC", [5300.0, 5321.41, None])]}}
+    with mock.patch.object(data_grabber.SESSION, "get", return_value=json_response(payload)):
+        assert data_grabber.get_prices(["^GSPC"]) == {"^GSPC": 5321.41}
+
+
+def test_get_prices_null_closes_do_not_drop_the_batch():
+    payload = {"spark": {"result": [
+        spark_result("^GSPC", [5321.41]),
+        spark_result("BAD", None),
+        spark_result("NONE", [None, None]),
+        {"symbol": "MALFORMED", "response": []},
+    ]}}
+    with mock.patch.object(data_grabber.SESSION, "get", return_value=json_response(payload)):
+        assert data_grabber.get_prices(["^GSPC", "BAD", "NONE", "MALFORMED"]) == {"^GSPC": 5321.41}
+
+
+def test_get_prices_batches_twenty_symbols_per_request():
+    symbols = [f"SYM{i}" for i in range(45)]
+
+    def spark(url, params, timeout):
+        batch = params["symbols"].split(",")
+        return json_response({"spark": {"result": [spark_result(s, [1.0]) for s in batch]}})
+
+    with mock.patch.object(data_grabber.SESSION, "get", side_effect=spark) as get:
+        prices = data_grabber.get_prices(symbols)
+    assert set(prices) == set(symbols)
+    assert sorted(len(c.kwargs["params"]["symbols"].split(",")) for c in get.call_args_list) == [5, 20, 20]
+
+
+FOREX_RATES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 149.3, "CHF": 0.88}
+
+
+def test_forex_matrix_is_exact_division_with_unit_diagonal():
+    currencies = ["USD", "GBP", "JPY", "EUR", "XXX"]
+    with mock.patch.object(data_grabber, "_get_forex_rates", return_value=FOREX_RATES):
+        matrix = data_grabber.get_forex_matrix(currencies)
+    # Unknown codes are dropped; order of the rest is kept
+    assert list(matrix.index) == ["USD", "GBP", "JPY", "EUR"]
+    assert list(matrix.columns) == list(matrix.index)
+    for i in matrix.index:
+        assert matrix.loc[i, i] == 1.0
+        for j in matrix.columns:
+            assert matrix.loc[i, j] == FOREX_RATES[j] / FOREX_RATES[i]
+
+
+def test_forex_matrix_no_known_currencies_returns_none():
+    with mock.patch.object(data_grabber, "_get_forex_rates", return_value=FOREX_RATES):
+        assert data_grabber.get_forex_matrix(["XXX"]) is None
+
+
+def test_get_rate_reads_one_pair():
+    with mock.patch.object(data_grabber, "_get_forex_rates", return_value=FOREX_RATES):
+        assert data_grabber.get_rate("GBP", "JPY") == FOREX_RATES["JPY"] / FOREX_RATES["GBP"]
+        assert data_grabber.get_rate("EUR", "EUR") == 1.0
+        assert data_grabber.get_rate("GBP", "XXX") is None
+
+
+def test_forex_rates_are_fetched_once_for_matrix_and_rate():
+    payload = {"rates": FOREX_RATES}
+    with mock.patch.object(data_grabber.SESSION, "get", return_value=json_response(payload)) as get:
+        data_grabber.get_forex_matrix(["USD", "EUR"])
+        data_grabber.get_rate("EUR", "USD")
+    assert get.call_count == 1
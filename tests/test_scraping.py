@@ -0,0 +1,113 @@
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "components"))
+
+import scraper
+
+
+class FakeResponse:
+    """Stands in for a streamed requests.Response, yielding the body in fixed chunks"""
+
+    def __init__(self, body, chunk_size=None, status_code=200, content_type="text/html", encoding=None):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+        self.encoding = encoding
+
+    def iter_content(self, chunk_size=1):
+        size = self.chunk_size or chunk_size
+        for i in range(0, len(self.body), size):
+            yield self.body[i:i + size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def fake_get(body, **kwargs):
+    return mock.patch.object(scraper.SESSION, "get", return_value=FakeResponse(body, **kwargs))
+
+
+QUOTE_PAGE = b"""<html><body>
+<span class="other">decoy</span>
+<span data-testid="qsp-price">5,321.41</span>
+<span class="js-signals_1 movers">NVDA</span>
+</body></html>"""
+
+
+def test_getData_dict_attrs_returns_span():
+    with fake_get(QUOTE_PAGE):
+        tag = scraper.getData("https://example.com", {"data-testid": "qsp-price"})
+    assert tag is not None
+    assert tag.name == "span"
+    assert tag.text == "5,321.41"
+
+
+def test_getData_class_string_returns_span():
+    with fake_get(QUOTE_PAGE):
+        tag = scraper.getData("https://example.com", "js-signals_1")
+    assert tag is not None
+    assert tag.name == "span"
+    assert tag.text == "NVDA"
+
+
+def test_streamFind_match_split_across_chunks():
+    # 7-byte chunks split the tag, its attributes and its text across feeds
+    with fake_get(QUOTE_PAGE, chunk_size=7):
+        tag = scraper.getData("https://example.com", {"data-testid": "qsp-price"})
+    assert tag.text == "5,321.41"
+
+
+def test_streamFind_stops_reading_after_match():
+    response = FakeResponse(QUOTE_PAGE, chunk_size=16)
+    chunks_read = []
+    original = response.iter_content
+    response.iter_content = lambda chunk_size=1: (chunks_read.append(c) or c for c in original(chunk_size))
+    with mock.patch.object(scraper.SESSION, "get", return_value=response):
+        tag = scraper.getData("https://example.com", {"data-testid": "qsp-price"})
+    assert tag.text == "5,321.41"
+    assert len(b"".join(chunks_read)) < len(QUOTE_PAGE)
+
+
+def test_streamFind_match_only_after_close():
+    # The span is never closed, so its end event only fires when the parser is closed
+    body = b'<html><body><span data-testid="qsp-price">5,321.41'
+    with fake_get(body):
+        tag = scraper.getData("https://example.com", {"data-testid": "qsp-price"})
+    assert tag is not None
+    assert tag.text == "5,321.41"
+
+
+def test_streamFind_class_string_matches_one_of_several_classes():
+    with fake_get(QUOTE_PAGE, chunk_size=5):
+        tag = scraper.getData("https://example.com", "movers")
+    assert tag.text == "NVDA"
+
+
+def test_getData_no_match_returns_none():
+    with fake_get(QUOTE_PAGE, chunk_size=5):
+        assert scraper.getData("https://example.com", {"data-testid": "missing"}) is None
+        assert scraper.getData("https://example.com", "missing-class") is None
+
+
+EURO_PAGE = '<html><body><span data-testid="qsp-price">1.234,5 \u20ac</span></body></html>'.encode("utf-8")
+
+
+def test_streamFind_uses_charset_from_header():
+    # No <meta charset>, so the header is the only hint that the page is UTF-8
+    with fake_get(EURO_PAGE, chunk_size=7, content_type="text/html; charset=utf-8", encoding="utf-8"):
+        tag = scraper.getData("https://example.com", {"data-testid": "qsp-price"})
+    assert tag.text == "1.234,5 \u20ac"
+
+
+def test_streamFind_ignores_default_encoding_without_charset():
+    # requests reports ISO-8859-1 for text/html without a charset; the page's meta tag must win
+    body = b'<html><head><meta charset="utf-8"></head>' + EURO_PAGE[len(b"<html>"):]
+    with fake_get(body, encoding="ISO-8859-1"):
+        tag = scraper.getData("https://example.com", {"data-testid": "qsp-price"})
+    assert tag.text == "1.234,5 \u20ac"